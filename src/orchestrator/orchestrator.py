@@ -12,17 +12,95 @@ Architecture:
 from __future__ import annotations
 
 import asyncio
+import contextlib
 import logging
-from typing import Literal
+import signal
+import time
+from collections import OrderedDict
+from typing import Generic, Literal, TypeVar
 
 from fastmcp import Client, Context, FastMCP
+from fastmcp.client.transports import StreamableHttpTransport
 from fastmcp.exceptions import ToolError
 from fastmcp.server.middleware import Middleware, MiddlewareContext
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
-logging.basicConfig(level=logging.DEBUG)
+
+# -------------------------------
+# Bounded TTL Map
+# -------------------------------
+
+K = TypeVar("K")
+V = TypeVar("V")
+
+
+class BoundedTTLMap(Generic[K, V]):
+    """
+    Small bounded mapping with time-based expiry.
+
+    Entries older than ``ttl`` seconds expire, and once ``maxsize`` entries
+    are tracked the oldest one is evicted. With ``refresh_on_get`` a read
+    also renews the entry, so ``ttl`` acts as an idle timeout instead of a
+    maximum age.
+    """
+
+    def __init__(
+        self, maxsize: int, ttl: float, *, refresh_on_get: bool = False
+    ) -> None:
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.refresh_on_get = refresh_on_get
+        # key -> (value, stamped_at), ordered from oldest to newest stamp
+        self._entries: OrderedDict[K, tuple[V, float]] = OrderedDict()
+
+    def get(self, key: K, default: V | None = None) -> V | None:
+        """Return the value for ``key`` unless it is missing or expired."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return default
+
+        value, stamped_at = entry
+        now = time.monotonic()
+        if now - stamped_at > self.ttl:
+            del self._entries[key]
+            return default
+
+        if self.refresh_on_get:
+            self._entries[key] = (value, now)
+            self._entries.move_to_end(key)
+        return value
+
+    def __setitem__(self, key: K, value: V) -> None:
+        self._entries[key] = (value, time.monotonic())
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def pop(self, key: K, default: V | None = None) -> V | None:
+        entry = self._entries.pop(key, None)
+        return default if entry is None else entry[0]
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def expire(self) -> int:
+        """Evict expired entries and return how many were removed."""
+        cutoff = time.monotonic() - self.ttl
+        removed = 0
+        # Entries are kept in stamp order, so stop at the first fresh one
+        while self._entries:
+            key, (_, stamped_at) = next(iter(self._entries.items()))
+            if stamped_at > cutoff:
+                break
+            del self._entries[key]
+            removed += 1
+        return removed
+
 
 # -------------------------------
 # Configuration
@@ -33,8 +111,37 @@ DOMAINS: dict[str, str] = {
     "invoicing": "http://127.0.0.1:9101/mcp",
     "products": "http://127.0.0.1:9102/mcp",
     "users": "http://127.0.0.1:9103/mcp",
-}  # Session to domain mapping (in production, use Redis or database)
-SESSION_DOMAIN: dict[str, str] = {}
+}
+
+# Session to domain mapping; idle sessions expire after an hour and at most
+# 10k are tracked (in production, use Redis or database)
+SESSION_DOMAIN: BoundedTTLMap[str, str] = BoundedTTLMap(
+    maxsize=10_000, ttl=3600.0, refresh_on_get=True
+)
+
+# Domain names, sorted once at import (DOMAINS is static configuration)
+AVAILABLE_DOMAINS: tuple[str, ...] = tuple(sorted(DOMAINS))
+AVAILABLE_DOMAINS_HINT = f"Available: {list(AVAILABLE_DOMAINS)}"
+
+# Tool-name prefix of each domain's mounted tools
+DOMAIN_PREFIXES: dict[str, str] = {name: f"{name}_" for name in DOMAINS}
+
+# Orchestrator tools, always available regardless of domain selection
+ORCHESTRATOR_TOOLS: frozenset[str] = frozenset(
+    {"list_domains", "get_session_status", "select_domain"}
+)
+
+# One Client per domain, used by the health probes and heartbeat
+DOMAIN_CLIENTS: dict[str, Client] = {}
+
+# Upper bound (seconds) for a single domain server health probe
+PROBE_TIMEOUT = 2.0
+
+# Interval (seconds) between sweeps of idle sessions from SESSION_DOMAIN
+SESSION_SWEEP_INTERVAL = 60.0
+
+# Interval (seconds) between heartbeats on the shared domain clients
+DOMAIN_HEARTBEAT_INTERVAL = 30.0
 
 # -------------------------------
 # Main Orchestrator Server
@@ -58,11 +165,11 @@ main = FastMCP(
 @main.tool(name="list_domains", tags={"orchestrator"})
 def list_domains() -> list[str]:
     """List available domain servers that can be selected for this session."""
-    return sorted(DOMAINS.keys())
+    return list(AVAILABLE_DOMAINS)
 
 
 @main.tool(name="get_session_status", tags={"orchestrator"})
-def get_session_status(ctx: Context) -> dict[str, str | list[str] | None]:
+def get_session_status(ctx: Context) -> dict[str, str | tuple[str, ...] | None]:
     """Get the current session status and selected domain."""
     session_id = ctx.session_id or ctx.client_id or "default"
     selected_domain = SESSION_DOMAIN.get(session_id)
@@ -70,7 +177,7 @@ def get_session_status(ctx: Context) -> dict[str, str | list[str] | None]:
     return {
         "session_id": session_id,
         "selected_domain": selected_domain,
-        "available_domains": list(DOMAINS.keys()),
+        "available_domains": AVAILABLE_DOMAINS,
         "status": "active" if selected_domain else "no_domain_selected",
     }
 
@@ -94,11 +201,12 @@ async def select_domain(
 
     # Validate domain
     if domain not in DOMAINS:
-        raise ToolError(f"Invalid domain: {domain}. Available: {list(DOMAINS.keys())}")
+        raise ToolError(f"Invalid domain: {domain}. {AVAILABLE_DOMAINS_HINT}")
 
     # Store domain selection for this session
     SESSION_DOMAIN[session_id] = domain
-    logger.info(f"Session {session_id} selected domain: {domain}")
+    domain_scope.invalidate(session_id)
+    logger.info("Session %s selected domain: %s", session_id, domain)
 
     # Notify clients to refresh their tool/resource lists
     await ctx.send_tool_list_changed()
@@ -129,69 +237,118 @@ class DomainScopeMiddleware(Middleware):
     4. Tool names are properly prefixed by domain
     """
 
-    # Define orchestrator tools explicitly
-    ORCHESTRATOR_TOOLS = {"list_domains", "get_session_status", "select_domain"}
+    # Seconds a filtered tool list is served from cache before refreshing
+    TOOLS_CACHE_TTL = 30.0
+
+    # Maximum number of sessions with a cached tool list
+    TOOLS_CACHE_MAXSIZE = 10_000
+
+    def __init__(self) -> None:
+        # session_id -> (selected_domain, filtered tools)
+        self._tools_cache: BoundedTTLMap[str | None, tuple[str | None, list]] = (
+            BoundedTTLMap(maxsize=self.TOOLS_CACHE_MAXSIZE, ttl=self.TOOLS_CACHE_TTL)
+        )
 
-    def _is_allowed_tool(self, tool_name: str, session_id: str | None) -> bool:
+    def invalidate(self, session_id: str | None) -> None:
+        """Drop the cached tool list for a session (e.g. after select_domain)."""
+        self._tools_cache.pop(session_id)
+
+    def expire(self) -> int:
+        """Drop stale cached tool lists and return how many were removed."""
+        return self._tools_cache.expire()
+
+    def clear(self) -> None:
+        """Drop every cached tool list (e.g. after a domain goes up or down)."""
+        self._tools_cache.clear()
+
+    def _is_allowed_tool(
+        self, tool_name: str, session_id: str | None, selected_domain: str | None
+    ) -> bool:
         """
         Check if a tool is allowed for the current session.
 
         Args:
             tool_name: Name of the tool
             session_id: Current session identifier
+            selected_domain: Domain already resolved for the session, if any
 
         Returns:
             True if tool is allowed, False otherwise
         """
         # Always allow orchestrator tools
-        if tool_name in self.ORCHESTRATOR_TOOLS:
-            logger.debug(f"Allowing orchestrator tool: {tool_name}")
+        if tool_name in ORCHESTRATOR_TOOLS:
+            logger.debug("Allowing orchestrator tool: %s", tool_name)
             return True
 
         # For domain tools, check session selection
         if not session_id:
-            logger.debug(f"Denying tool {tool_name}: no session_id")
+            logger.debug("Denying tool %s: no session_id", tool_name)
             return False  # No session means no domain access
 
-        selected_domain = SESSION_DOMAIN.get(session_id)
         if not selected_domain:
             logger.debug(
-                f"Denying tool {tool_name}: no domain selected for session {session_id}"
+                "Denying tool %s: no domain selected for session %s",
+                tool_name,
+                session_id,
             )
             return False  # No domain selected yet
 
         # Check if tool name matches selected domain prefix
-        matches = tool_name.startswith(f"{selected_domain}_")
+        matches = tool_name.startswith(DOMAIN_PREFIXES[selected_domain])
         logger.debug(
-            f"Tool {tool_name}, session {session_id}, domain {selected_domain}: {'ALLOW' if matches else 'DENY'}"
+            "Tool %s, session %s, domain %s: %s",
+            tool_name,
+            session_id,
+            selected_domain,
+            "ALLOW" if matches else "DENY",
         )
         return matches
 
     async def on_list_tools(self, ctx: MiddlewareContext, call_next):
         """Filter tools based on session domain selection."""
-        # Get all tools from downstream
-        tools = await call_next(ctx)
-        logger.debug(f"Total tools from downstream: {len(tools)}")
-
         # Get session ID
         session_id = (
             getattr(ctx.fastmcp_context, "session_id", None)
             if ctx.fastmcp_context
             else None
         )
-        logger.debug(f"Session ID: {session_id}")
+        logger.debug("Session ID: %s", session_id)
+
+        # Serve from cache while the session's domain is unchanged and fresh
+        selected_domain = SESSION_DOMAIN.get(session_id) if session_id else None
+        cached = self._tools_cache.get(session_id)
+        if cached is not None and cached[0] == selected_domain:
+            logger.debug("Session %s: serving cached tool list", session_id)
+            return list(cached[1])
 
-        # Filter tools based on session and domain
-        filtered_tools = [
-            tool for tool in tools if self._is_allowed_tool(tool.name, session_id)
-        ]
+        # Get all tools from downstream
+        tools = await call_next(ctx)
+        logger.debug("Total tools from downstream: %d", len(tools))
+
+        # Filter in a single pass using the session's domain prefix
+        # (locals avoid attribute/global lookups inside the comprehension)
+        orchestrator_tools = ORCHESTRATOR_TOOLS
+        prefix = DOMAIN_PREFIXES.get(selected_domain)
+        if prefix:
+            filtered_tools = [
+                tool
+                for tool in tools
+                if tool.name in orchestrator_tools or tool.name.startswith(prefix)
+            ]
+        else:
+            filtered_tools = [tool for tool in tools if tool.name in orchestrator_tools]
 
         logger.debug(
-            f"Session {session_id}: filtered {len(tools)} tools to {len(filtered_tools)}"
+            "Session %s: filtered %d tools to %d",
+            session_id,
+            len(tools),
+            len(filtered_tools),
         )
-        logger.debug(f"Final tools: {[t.name for t in filtered_tools]}")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Final tools: %s", [t.name for t in filtered_tools])
 
-        return filtered_tools
+        self._tools_cache[session_id] = (selected_domain, filtered_tools)
+        return list(filtered_tools)
 
     async def on_call_tool(self, ctx: MiddlewareContext, call_next):
         """Validate tool access before execution."""
@@ -202,12 +359,14 @@ class DomainScopeMiddleware(Middleware):
             else None
         )
 
+        # Resolve the session's domain once for both the check and the error
+        selected_domain = SESSION_DOMAIN.get(session_id) if session_id else None
+
         # Check if tool is allowed
-        if not self._is_allowed_tool(tool_name, session_id):
-            selected_domain = SESSION_DOMAIN.get(session_id or "", "none")
+        if not self._is_allowed_tool(tool_name, session_id, selected_domain):
             raise ToolError(
                 f"Tool '{tool_name}' is not available for this session. "
-                f"Current domain: {selected_domain}. "
+                f"Current domain: {selected_domain or 'none'}. "
                 f"Use 'select_domain' to choose a domain first."
             )
 
@@ -216,7 +375,8 @@ class DomainScopeMiddleware(Middleware):
 
 
 # Add middleware to the main server
-main.add_middleware(DomainScopeMiddleware())
+domain_scope = DomainScopeMiddleware()
+main.add_middleware(domain_scope)
 
 
 # -------------------------------
@@ -224,7 +384,36 @@ main.add_middleware(DomainScopeMiddleware())
 # -------------------------------
 
 
-def setup_domain_servers() -> None:
+def get_domain_client(domain_name: str) -> Client:
+    """Return the shared Client for a domain, creating it on first use."""
+    client = DOMAIN_CLIENTS.get(domain_name)
+    if client is None:
+        transport = StreamableHttpTransport(url=DOMAINS[domain_name])
+        client = DOMAIN_CLIENTS[domain_name] = Client(transport)
+    return client
+
+
+async def _mount_domain_server(domain_name: str, server_url: str) -> None:
+    """Mount a single domain server proxy, logging (not raising) on failure."""
+    try:
+        # Proxy from a disconnected copy of the domain client (explicit
+        # transport), so each proxied request opens its own session
+        client = get_domain_client(domain_name).new()
+
+        # Create proxy server from the client
+        proxy_server = FastMCP.as_proxy(client)
+
+        # Mount the proxy with domain prefix
+        main.mount(proxy_server, prefix=domain_name)
+
+        logger.info("✓ Mounted %s domain from %s", domain_name, server_url)
+
+    except Exception as e:
+        logger.warning("⚠ Failed to mount %s domain: %s", domain_name, e)
+        logger.info("Domain %s will be available when server starts", domain_name)
+
+
+async def setup_domain_servers() -> None:
     """
     Set up proxy connections to remote domain servers.
 
@@ -233,44 +422,101 @@ def setup_domain_servers() -> None:
     - invoicing_create_invoice, invoicing_get_invoice, invoicing_pay_invoice
     - products_search_products, products_get_product, products_check_stock
     - users_get_user, users_update_email, users_list_dependents
+
+    Domains are mounted concurrently; a failing domain does not affect the
+    others.
     """
     logger.info("Setting up domain server proxies...")
 
-    for domain_name, server_url in DOMAINS.items():
-        try:
-            # Create HTTP client for the domain server with explicit transport
-            from fastmcp.client.transports import StreamableHttpTransport
+    await asyncio.gather(
+        *(_mount_domain_server(name, url) for name, url in DOMAINS.items()),
+        return_exceptions=True,
+    )
 
-            transport = StreamableHttpTransport(url=server_url)
-            client = Client(transport)
 
-            # Create proxy server from the client
-            proxy_server = FastMCP.as_proxy(client)
+async def connect_domain_client(domain_name: str) -> Client:
+    """Return the domain's shared Client with its session open."""
+    client = get_domain_client(domain_name)
+    if not client.is_connected():
+        await reset_domain_client(client)
+        await client.__aenter__()
+    return client
 
-            # Mount the proxy with domain prefix
-            main.mount(proxy_server, prefix=domain_name)
 
-            logger.info(f"✓ Mounted {domain_name} domain from {server_url}")
+async def reset_domain_client(client: Client) -> None:
+    """Discard state left behind by a failed or dropped session."""
+    # close() re-raises the error that ended the previous session
+    with contextlib.suppress(Exception):
+        await client.close()
 
-        except Exception as e:
-            logger.warning(f"⚠ Failed to mount {domain_name} domain: {e}")
-            logger.info(f"Domain {domain_name} will be available when server starts")
-            # Continue with other domains even if one fails
 
+async def disconnect_domain_clients() -> None:
+    """Close the sessions opened by connect_domain_client."""
+    await asyncio.gather(
+        *(client.close() for client in DOMAIN_CLIENTS.values()),
+        return_exceptions=True,
+    )
 
-async def check_domain_servers() -> dict[str, bool]:
-    """Check which domain servers are available."""
-    status = {}
-    for domain_name, server_url in DOMAINS.items():
-        try:
-            async with Client(server_url) as client:
+
+async def _probe_domain_server(domain_name: str) -> tuple[str, bool]:
+    """Probe a single domain server, bounded by PROBE_TIMEOUT seconds."""
+    try:
+        async with asyncio.timeout(PROBE_TIMEOUT):
+            client = await connect_domain_client(domain_name)
+            try:
                 await client.list_tools()
-                status[domain_name] = True
-                logger.info(f"✓ Domain server {domain_name} is available")
-        except Exception as e:
-            status[domain_name] = False
-            logger.warning(f"⚠ Domain server {domain_name} not available: {e}")
-    return status
+            except Exception:
+                # The session may have dropped: reconnect once and retry
+                await reset_domain_client(client)
+                client = await connect_domain_client(domain_name)
+                await client.list_tools()
+        logger.debug("✓ Domain server %s is available", domain_name)
+        return domain_name, True
+    except Exception as e:
+        logger.debug("⚠ Domain server %s not available: %s", domain_name, e)
+        return domain_name, False
+
+
+async def check_domain_servers() -> dict[str, bool]:
+    """Check which domain servers are available (all probes run concurrently)."""
+    results = await asyncio.gather(
+        *(_probe_domain_server(domain_name) for domain_name in DOMAINS)
+    )
+    return dict(results)
+
+
+async def monitor_domain_servers(status: dict[str, bool]) -> None:
+    """
+    Heartbeat the shared domain clients, reconnecting dropped sessions.
+
+    Args:
+        status: Last known availability per domain; only changes are logged
+    """
+    while True:
+        await asyncio.sleep(DOMAIN_HEARTBEAT_INTERVAL)
+        changed = False
+        for domain_name, available in (await check_domain_servers()).items():
+            if available and not status.get(domain_name):
+                logger.info("✓ Domain server %s is available", domain_name)
+                changed = True
+            elif not available and status.get(domain_name):
+                logger.warning("⚠ Domain server %s became unavailable", domain_name)
+                changed = True
+            status[domain_name] = available
+
+        # Cached tool lists may lack (or still list) the flipped domain's tools
+        if changed:
+            domain_scope.clear()
+
+
+async def sweep_idle_sessions() -> None:
+    """Periodically evict idle sessions so handlers don't pay for it."""
+    while True:
+        await asyncio.sleep(SESSION_SWEEP_INTERVAL)
+        removed = SESSION_DOMAIN.expire()
+        domain_scope.expire()
+        if removed:
+            logger.info("Evicted %d idle session(s)", removed)
 
 
 # -------------------------------
@@ -278,12 +524,12 @@ async def check_domain_servers() -> dict[str, bool]:
 # -------------------------------
 
 
-async def main_async() -> None:
-    """Main async setup function."""
+async def main_async() -> dict[str, bool]:
+    """Main async setup function. Returns the initial domain availability."""
     logger.info("Starting FastMCP Orchestrator...")
 
     # Setup domain server proxies (non-blocking)
-    setup_domain_servers()
+    await setup_domain_servers()
 
     # Check initial status of domain servers
     status = await check_domain_servers()
@@ -291,30 +537,62 @@ async def main_async() -> None:
     unavailable_domains = [name for name, available in status.items() if not available]
 
     if available_domains:
-        logger.info(f"✓ Available domains: {', '.join(available_domains)}")
+        logger.info("✓ Available domains: %s", ", ".join(available_domains))
     if unavailable_domains:
         logger.info(
-            f"⚠ Unavailable domains: {', '.join(unavailable_domains)} (will retry on demand)"
+            "⚠ Unavailable domains: %s (will retry on demand)",
+            ", ".join(unavailable_domains),
         )
 
     logger.info("Orchestrator setup complete!")
+    return status
 
 
-def start_orchestrator():
+async def start_orchestrator() -> None:
     """Start the orchestrator server."""
     logger.info("Starting orchestrator server on http://127.0.0.1:9100")
-    main.run(transport="http", host="127.0.0.1", port=9100)
+    await main.run_async(transport="http", host="127.0.0.1", port=9100)
 
 
-if __name__ == "__main__":
-    # Run async setup in background
+async def run() -> None:
+    """Run setup and the orchestrator HTTP server in a single event loop."""
+    status: dict[str, bool] = {}
     try:
-        asyncio.run(main_async())
+        status = await main_async()
     except Exception as e:
-        logger.error(f"Setup failed: {e}")
+        logger.error("Setup failed: %s", e)
         logger.info(
             "Starting orchestrator anyway (domains will be available when ready)"
         )
 
-    # Start the orchestrator HTTP server
-    start_orchestrator()
+    # Start the orchestrator HTTP server; heartbeat domains and sweep idle
+    # sessions in the background meanwhile
+    background = [
+        asyncio.create_task(monitor_domain_servers(status)),
+        asyncio.create_task(sweep_idle_sessions()),
+    ]
+    try:
+        await start_orchestrator()
+    finally:
+        for task in background:
+            task.cancel()
+        try:
+            await asyncio.gather(*background, return_exceptions=True)
+        finally:
+            # Still runs when Ctrl-C cancels run() while awaiting the tasks
+            await disconnect_domain_clients()
+
+
+if __name__ == "__main__":
+    # Treat SIGTERM like Ctrl-C so run() still closes the domain sessions
+    signal.signal(signal.SIGTERM, signal.default_int_handler)
+
+    try:
+        # libuv-based event loop; a dependency everywhere except Windows
+        import uvloop
+
+        runner = uvloop.run
+    except ImportError:
+        runner = asyncio.run
+
+    runner(run())
@@ -1,13 +1,13 @@
 from fastmcp import FastMCP
-import time
+import asyncio
 
 mcp = FastMCP()
 
 
 @mcp.tool()
-def async_tool() -> str:
+async def async_tool() -> str:
     """Async tool demo."""
-    time.sleep(5)
+    await asyncio.sleep(5)
     return "Finished!"
 
 